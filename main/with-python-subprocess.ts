@@ -247,24 +247,22 @@ const initializePython = async () => {
     try { console.log("Python subprocess started, PID:", pyProc.pid); } catch (e) {}
     
     // Handle subprocess output
+    // Protocol: stdout carries exactly one JSON message per line (the Python side routes all other
+    // output to stderr). Chunks can end mid-line, so keep the trailing partial line for the next chunk.
     if (pyProc.stdout) {
+        let pendingOutput = '';
+        let protocolErrors = 0;
         pyProc.stdout.on('data', (data: Buffer) => {
-            const output = data.toString();
-            // Do not spam logs with entire buffer; handle line-by-line
-            const lines = output.split('\n');
+            const lines = (pendingOutput + data.toString()).split('\n');
+            pendingOutput = lines.pop() || '';
             for (const line of lines) {
                 const trimmed = line.trim();
                 if (!trimmed) continue;
-                // Only parse lines that look like JSON; ignore other stdout noise from native libs
-                if (trimmed.startsWith('{') || trimmed.startsWith('[')) {
-                    try {
-                        const message = JSON.parse(trimmed);
-                        handlePythonMessage(message);
-                    } catch (e) {
-                        try { console.error('Error parsing Python message:', e, 'Raw:', trimmed); } catch (e) {}
-                    }
-                } else {
-                    try { console.log('Python stdout (non-JSON):', trimmed); } catch (e) {}
+                try {
+                    handlePythonMessage(JSON.parse(trimmed));
+                } catch (e) {
+                    protocolErrors++;
+                    try { console.error(`Invalid Python protocol line (${protocolErrors} so far):`, e, 'Raw:', trimmed); } catch (e) {}
                 }
             }
         });
@@ -3,38 +3,119 @@ import cv2
 import numpy as np
 import threading
 import time
+import queue
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Callable
 import csv
+import gc
+import logging
+from collections import OrderedDict
 from datetime import datetime
 import requests
 import sys
+import importlib.util
 
-# Conditional imports to avoid conflicts between environments
+logger = logging.getLogger(__name__)
+
+# Conditional imports to avoid conflicts between environments.
+# Torch/Ultralytics and TensorFlow/RetinaFace take seconds to import, so at startup we only
+# check that they are installed and import them when a model is first used.
+# Set FACE_EAGER_IMPORT=1 to import them up front (useful when debugging broken environments).
 YOLO_AVAILABLE = False
 RETINAFACE_AVAILABLE = False
+YOLO = None
+torch = None
 
-# Try to import YOLO (ultralytics + torch)
-try:
-    from ultralytics import YOLO
-    import torch
+# Check for YOLO (ultralytics + torch)
+if importlib.util.find_spec("ultralytics") is not None and importlib.util.find_spec("torch") is not None:
     YOLO_AVAILABLE = True
-    print("YOLO/Ultralytics loaded successfully", file=sys.stderr)
-except ImportError as e:
-    print(f"YOLO/Ultralytics not available: {e}", file=sys.stderr)
+else:
+    print("YOLO/Ultralytics not available: ultralytics or torch is not installed", file=sys.stderr)
 
-# Try to import RetinaFace (Apple Silicon only)
-try:
-    import platform
-    is_darwin = sys.platform == 'darwin'
-    is_arm64 = platform.machine().lower() == 'arm64'
-    if is_darwin and is_arm64:
-        from retinaface import RetinaFace
+# Check for RetinaFace (Apple Silicon only)
+import platform
+is_darwin = sys.platform == 'darwin'
+is_arm64 = platform.machine().lower() == 'arm64'
+if is_darwin and is_arm64:
+    if importlib.util.find_spec("retinaface") is not None:
         RETINAFACE_AVAILABLE = True
-        print("RetinaFace loaded successfully", file=sys.stderr)
     else:
-        print("RetinaFace disabled: only supported on Apple Silicon (arm64) Macs", file=sys.stderr)
-except ImportError as e:
-    print(f"RetinaFace not available: {e}", file=sys.stderr)
+        print("RetinaFace not available: retinaface is not installed", file=sys.stderr)
+else:
+    print("RetinaFace disabled: only supported on Apple Silicon (arm64) Macs", file=sys.stderr)
+
+def _import_yolo() -> bool:
+    """Import Ultralytics and torch on first use, returning whether YOLO is usable"""
+    global YOLO, torch, YOLO_AVAILABLE
+    if YOLO is not None:
+        return True
+    if not YOLO_AVAILABLE:
+        return False
+    try:
+        from ultralytics import YOLO as _YOLO
+        import torch as _torch
+    except ImportError as e:
+        YOLO_AVAILABLE = False
+        print(f"YOLO/Ultralytics not available: {e}", file=sys.stderr)
+        return False
+    YOLO, torch = _YOLO, _torch
+    print("YOLO/Ultralytics loaded successfully", file=sys.stderr)
+    return True
+
+def _import_retinaface() -> bool:
+    """Import RetinaFace on first use, returning whether it is usable"""
+    global RETINAFACE_AVAILABLE
+    if not RETINAFACE_AVAILABLE:
+        return False
+    try:
+        from retinaface import RetinaFace  # noqa: F401
+    except ImportError as e:
+        RETINAFACE_AVAILABLE = False
+        print(f"RetinaFace not available: {e}", file=sys.stderr)
+        return False
+    return True
+
+if os.environ.get("FACE_EAGER_IMPORT") == "1":
+    _import_yolo()
+    _import_retinaface()
+
+# YOLO face models offered in the UI (smallest first) and where their weights are published
+YOLO_FACE_MODELS = (
+    "yolov8n-face.pt",
+    "yolov8m-face.pt",
+    "yolov8l-face.pt",
+    "yolov11m-face.pt",
+    "yolov11l-face.pt",
+    "yolov12l-face.pt",
+)
+YOLO_FACE_MODEL_URL = "https://github.com/akanametov/yolo-face/releases/download/v0.0.0/{}"
+
+# Supported file extensions (lowercase), as sets for O(1) lookups on os.path.splitext results
+IMAGE_EXTENSIONS = frozenset(('.jpg', '.jpeg', '.png', '.bmp', '.tiff'))
+VIDEO_EXTENSIONS = frozenset(('.mp4', '.avi', '.mov'))
+
+# Input size used by the YOLO face models; images are downscaled to this once on load
+YOLO_IMGSZ = 640
+PREPROCESS_CACHE_SIZE = 32
+
+# Write buffer for detection CSV exports
+CSV_WRITE_BUFFER_SIZE = 1 << 20
+
+# Chunk size for streaming model downloads to disk
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# Default number of images/frames sent to YOLO in one batched forward pass
+YOLO_BATCH_SIZE = 8
+
+# Threads decoding/resizing upcoming images while the current batch runs inference
+DECODE_WORKERS = min(8, os.cpu_count() or 1)
+
+# Number of concurrent YOLO workers (each with its own model replica and CUDA stream) on CUDA devices
+CUDA_STREAM_WORKERS = 2
+
+# Dummy forward passes run after loading a model so kernel selection/allocation happens before the first real image
+WARMUP_ITERATIONS = 2
 
 class FaceDetectionProcessor:
     def __init__(self, progress_callback: Optional[Callable] = None, completion_callback: Optional[Callable] = None):
@@ -45,6 +126,15 @@ class FaceDetectionProcessor:
         self.results = []
         self.model_type = "YOLO"
         self.current_model_path = None
+        self.device = 'cpu'
+        self.half = False
+        self._loaded_model_path = None
+        self._warmed_up = None
+        self._retinaface_model = None
+        # Extra YOLO models for concurrent CUDA stream workers, built on first use (None until then)
+        self._model_replicas = None
+        # Largest batch the loaded model accepts (None when unbounded); TensorRT engines are built for a maximum batch
+        self._max_batch_size = None
         
         # Status symbols for better user feedback
         self.status_symbols = {
@@ -64,6 +154,10 @@ class FaceDetectionProcessor:
         # Set up a writable directory for storing downloaded models when running from a read-only filesystem
         # like AppImage. Uses FACE_MODEL_DIR if provided, otherwise XDG_DATA_HOME or ~/.local/share.
         self._model_dir = None
+        
+        # Recently preprocessed images keyed by (path, mtime) so sweeps over the same files skip decode/resize
+        self._preprocess_cache = OrderedDict()
+        self._preprocess_lock = threading.Lock()
     
     def _get_model_dir(self) -> str:
         """Return a writable directory path for model files and ensure it exists."""
@@ -86,43 +180,46 @@ class FaceDetectionProcessor:
         
     def _download_face_model(self, model_name: str) -> bool:
         """Download face detection model from GitHub releases"""
-        face_models_urls = {
-            "yolov8n-face.pt": "https://github.com/akanametov/yolo-face/releases/download/v0.0.0/yolov8n-face.pt",
-            "yolov8m-face.pt": "https://github.com/akanametov/yolo-face/releases/download/v0.0.0/yolov8m-face.pt",
-            "yolov8l-face.pt": "https://github.com/akanametov/yolo-face/releases/download/v0.0.0/yolov8l-face.pt",
-            "yolov11m-face.pt": "https://github.com/akanametov/yolo-face/releases/download/v0.0.0/yolov11m-face.pt",
-            "yolov11l-face.pt": "https://github.com/akanametov/yolo-face/releases/download/v0.0.0/yolov11l-face.pt",
-            "yolov12l-face.pt": "https://github.com/akanametov/yolo-face/releases/download/v0.0.0/yolov12l-face.pt"
-        }
-        
-        if model_name not in face_models_urls:
+        if model_name not in YOLO_FACE_MODELS:
             return False
             
         try:
-            url = face_models_urls[model_name]
+            url = YOLO_FACE_MODEL_URL.format(model_name)
             if self.progress_callback:
                 self.progress_callback(f"{self.status_symbols['info']} Downloading {model_name} from GitHub...")
             
             # Download with progress
-            response = requests.get(url, stream=True)
+            response = requests.get(url, stream=True, timeout=30)
             response.raise_for_status()
             
             total_size = int(response.headers.get('content-length', 0))
             downloaded = 0
+            last_reported = -1
             
             # Always write to a writable model directory
             model_filename = os.path.basename(model_name)
             save_dir = self._get_model_dir()
             save_path = os.path.join(save_dir, model_filename)
             
-            with open(save_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if total_size > 0 and self.progress_callback:
-                            progress = (downloaded / total_size) * 100
-                            self.progress_callback(f"{self.status_symbols['processing']} Downloading {model_name}: {progress:.1f}%")
+            # Stream into a .part file and rename it into place once complete, so an interrupted
+            # download is never mistaken for a cached model by the exists() check in load_model
+            partial_path = save_path + '.part'
+            try:
+                with open(partial_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        if chunk:
+                            f.write(chunk)
+                            downloaded += len(chunk)
+                            # Report each whole percent once rather than once per chunk
+                            if total_size > 0 and self.progress_callback:
+                                progress = int(downloaded * 100 / total_size)
+                                if progress != last_reported:
+                                    last_reported = progress
+                                    self.progress_callback(f"{self.status_symbols['processing']} Downloading {model_name}: {progress}%")
+                os.replace(partial_path, save_path)
+            finally:
+                if os.path.exists(partial_path):
+                    os.remove(partial_path)
             
             if self.progress_callback:
                 self.progress_callback(f"{self.status_symbols['success']} Downloaded {model_name} successfully to {save_path}")
@@ -135,8 +232,75 @@ class FaceDetectionProcessor:
                 self.progress_callback(f"{self.status_symbols['error']} Error downloading {model_name}: {str(e)}")
             return False
         
-    def load_model(self, model_path: str = "yolov8n.pt"):
-        """Load model for face detection (YOLO, RetinaFace, or OpenCV)"""
+    def _get_int8_onnx_model(self, model_path: str) -> Optional[str]:
+        """Return an INT8-quantized ONNX companion of a YOLO model, exporting it on first use"""
+        int8_path = os.path.splitext(model_path)[0] + ".int8.onnx"
+        if os.path.exists(int8_path):
+            return int8_path
+        
+        try:
+            # Dynamic per-channel quantization needs no calibration data
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+            
+            if self.progress_callback:
+                self.progress_callback(f"{self.status_symbols['processing']} Exporting INT8 ONNX model for CPU inference...")
+            # Dynamic axes so the batched predict calls (up to YOLO_BATCH_SIZE images) are accepted
+            onnx_path = YOLO(model_path).export(format='onnx', dynamic=True, simplify=True, batch=YOLO_BATCH_SIZE)
+            quantize_dynamic(onnx_path, int8_path, weight_type=QuantType.QUInt8)
+            if self.progress_callback:
+                self.progress_callback(f"{self.status_symbols['success']} INT8 ONNX model saved to {int8_path}")
+            return int8_path
+        except Exception as e:
+            if self.progress_callback:
+                self.progress_callback(f"{self.status_symbols['warning']} INT8 export unavailable, using PyTorch model: {str(e)}")
+            return None
+        
+    def _get_openvino_model(self, model_path: str) -> Optional[str]:
+        """Return an OpenVINO IR export of a YOLO model, exporting it on first use"""
+        openvino_dir = os.path.splitext(model_path)[0] + "_openvino_model"
+        if os.path.isdir(openvino_dir):
+            return openvino_dir
+        
+        try:
+            if self.progress_callback:
+                self.progress_callback(f"{self.status_symbols['processing']} Exporting OpenVINO model for CPU inference...")
+            # Dynamic shapes so batched predict calls are accepted; the performance hint is chosen
+            # when the model is first loaded for prediction (see load_model), not here
+            openvino_dir = YOLO(model_path).export(format='openvino', dynamic=True, half=True, batch=YOLO_BATCH_SIZE)
+            if self.progress_callback:
+                self.progress_callback(f"{self.status_symbols['success']} OpenVINO model saved to {openvino_dir}")
+            return openvino_dir
+        except Exception as e:
+            if self.progress_callback:
+                self.progress_callback(f"{self.status_symbols['warning']} OpenVINO export unavailable, using PyTorch model: {str(e)}")
+            return None
+        
+    def _get_tensorrt_engine(self, model_path: str, half: bool) -> Optional[str]:
+        """Return a TensorRT engine built from a YOLO model for this GPU, building it on first use"""
+        engine_path = os.path.splitext(model_path)[0] + (".fp16.engine" if half else ".engine")
+        if os.path.exists(engine_path):
+            return engine_path
+        
+        try:
+            if self.progress_callback:
+                self.progress_callback(f"{self.status_symbols['processing']} Building TensorRT engine (this can take several minutes)...")
+            # Ultralytics goes through ONNX and writes <model>.engine; keep FP16/FP32 builds side by side
+            exported_path = YOLO(model_path).export(format='engine', half=half, dynamic=True, batch=YOLO_BATCH_SIZE, device=0)
+            if exported_path != engine_path:
+                os.replace(exported_path, engine_path)
+            if self.progress_callback:
+                self.progress_callback(f"{self.status_symbols['success']} TensorRT engine saved to {engine_path}")
+            return engine_path
+        except Exception as e:
+            if self.progress_callback:
+                self.progress_callback(f"{self.status_symbols['warning']} TensorRT export unavailable, using PyTorch model: {str(e)}")
+            return None
+        
+    def load_model(self, model_path: str = "yolov8n.pt", precision: str = "fp32"):
+        """Load model for face detection (YOLO, RetinaFace, or OpenCV)
+        
+        precision applies to YOLO models: "fp32", "fp16" (CUDA only) or "int8" (CPU only, via an INT8 ONNX export).
+        """
         try:
             if model_path.lower() == "retinaface":
                 # This is the RetinaFace case (moved here for clarity)
@@ -144,21 +308,23 @@ class FaceDetectionProcessor:
                 self.current_model_path = model_path
                 
                 # Ensure RetinaFace is actually available before proceeding
-                if not RETINAFACE_AVAILABLE:
+                if not _import_retinaface():
                     if self.progress_callback:
                         self.progress_callback(f"{self.status_symbols['error']} RetinaFace is not available in this environment")
                         self.progress_callback(f"{self.status_symbols['info']} Please use YOLO model or switch to an Apple Silicon Mac (arm64)")
                     return False
                 
-                # RetinaFace doesn't need explicit loading - it loads models on first use
-                # Just verify it's available and working
-                try:
-                    # This will trigger model download if not already present
-                    if self.progress_callback:
-                        self.progress_callback(f"{self.status_symbols['info']} RetinaFace will download models on first use if needed")
-                except Exception as e:
-                    if self.progress_callback:
-                        self.progress_callback(f"{self.status_symbols['warning']} RetinaFace initialization warning: {str(e)}")
+                # Build the network once here (downloading weights if needed) and pass it to every
+                # detect_faces call, instead of paying for it on the first image
+                if self._retinaface_model is None:
+                    try:
+                        from retinaface import RetinaFace as _RetinaFace
+                        if self.progress_callback:
+                            self.progress_callback(f"{self.status_symbols['processing']} Building RetinaFace model (downloads weights on first use)...")
+                        self._retinaface_model = _RetinaFace.build_model()
+                    except Exception as e:
+                        if self.progress_callback:
+                            self.progress_callback(f"{self.status_symbols['warning']} RetinaFace initialization warning: {str(e)}")
                 
                 if self.progress_callback:
                     self.progress_callback(f"{self.status_symbols['success']} RetinaFace model ready")
@@ -196,8 +362,8 @@ class FaceDetectionProcessor:
                     if self.progress_callback:
                         self.progress_callback(f"{self.status_symbols['success']} Found existing model: {os.path.basename(resolved_model_path)}")
                 
-                # Check if YOLO is available before loading
-                if not YOLO_AVAILABLE:
+                # Check if YOLO is available before loading (imports it on first use)
+                if not _import_yolo():
                     if self.progress_callback:
                         self.progress_callback(f"{self.status_symbols['error']} YOLO/Ultralytics is not available in this environment")
                         self.progress_callback(f"{self.status_symbols['info']} Please use RetinaFace model or switch to YOLO environment")
@@ -215,17 +381,81 @@ class FaceDetectionProcessor:
                 if self.progress_callback:
                     self.progress_callback(f"{self.status_symbols['processing']} Loading YOLO model: {resolved_model_path}")
                 
-                # Load YOLO model (removed signal timeout as it doesn't work in subprocess)
-                self.model = YOLO(resolved_model_path)
-                # Move to device in a separate try-catch to handle device issues
-                try:
-                    self.model = self.model.to(device)
+                # CPU-only deployments can opt into an exported backend via FACE_CPU_BACKEND:
+                # "onnx-int8" (INT8-quantized ONNX Runtime) or "openvino" (OpenVINO THROUGHPUT mode)
+                cpu_backend = os.environ.get("FACE_CPU_BACKEND", "").lower() if device == 'cpu' else ""
+                if precision == "int8":
+                    if device == 'cpu':
+                        cpu_backend = "onnx-int8"
+                    elif self.progress_callback:
+                        self.progress_callback(f"{self.status_symbols['warning']} INT8 precision is only supported for CPU inference, using {'FP16' if device.startswith('cuda') else 'FP32'} on {device}")
+                # CUDA deployments can opt into a TensorRT engine via FACE_GPU_BACKEND=tensorrt
+                gpu_backend = os.environ.get("FACE_GPU_BACKEND", "").lower() if device.startswith('cuda') else ""
+                exported_model_path = None
+                exported_device = 'cpu'
+                if cpu_backend == "onnx-int8":
+                    exported_model_path = self._get_int8_onnx_model(resolved_model_path)
+                elif cpu_backend == "openvino":
+                    exported_model_path = self._get_openvino_model(resolved_model_path)
+                elif gpu_backend == "tensorrt":
+                    exported_model_path = self._get_tensorrt_engine(resolved_model_path, precision in ("fp16", "int8"))
+                    exported_device = device
+                backend = cpu_backend or gpu_backend
+                
+                target_model_path = exported_model_path or resolved_model_path
+                target_device = exported_device if exported_model_path else device
+                if self.model is not None and self._loaded_model_path == target_model_path and self.device == target_device:
+                    # The same weights are already resident on the same device - skip re-reading them from disk
                     if self.progress_callback:
-                        self.progress_callback(f"{self.status_symbols['info']} Using device: {device}")
-                except Exception as device_error:
+                        self.progress_callback(f"{self.status_symbols['info']} Reusing loaded model on {self.device}")
+                elif exported_model_path:
+                    # Exported models run on their own runtime and device and cannot be moved with .to()
+                    # Forget the old model's identity first, so a failed load can never pass the reuse check
+                    self._loaded_model_path = None
+                    self._model_replicas = None
+                    self.model = YOLO(exported_model_path, task='detect')
+                    self.device = exported_device
+                    self._loaded_model_path = exported_model_path
+                    self._max_batch_size = YOLO_BATCH_SIZE if backend == "tensorrt" else None
                     if self.progress_callback:
-                        self.progress_callback(f"{self.status_symbols['warning']} Device {device} failed, falling back to CPU: {str(device_error)}")
-                    self.model = self.model.to('cpu')
+                        self.progress_callback(f"{self.status_symbols['info']} Using device: {exported_device} ({backend})")
+                else:
+                    # Load YOLO model (removed signal timeout as it doesn't work in subprocess)
+                    # Forget the old model's identity first, so a failed load can never pass the reuse check
+                    self._loaded_model_path = None
+                    self._model_replicas = None
+                    self._max_batch_size = None
+                    self.model = YOLO(resolved_model_path)
+                    # Move to device in a separate try-catch to handle device issues
+                    try:
+                        self.model = self.model.to(device)
+                        self.device = device
+                        if self.progress_callback:
+                            self.progress_callback(f"{self.status_symbols['info']} Using device: {device}")
+                    except Exception as device_error:
+                        if self.progress_callback:
+                            self.progress_callback(f"{self.status_symbols['warning']} Device {device} failed, falling back to CPU: {str(device_error)}")
+                        self.model = self.model.to('cpu')
+                        self.device = 'cpu'
+                    self._loaded_model_path = resolved_model_path
+                    
+                    # Opt-in: FACE_TORCH_COMPILE=1 compiles the network on CUDA. The warmup below only compiles the
+                    # 640x640 single-image shape; other letterbox shapes and batch sizes compile (and capture
+                    # their CUDA graphs) the first time they are seen during a run
+                    if os.environ.get("FACE_TORCH_COMPILE") == "1" and self.device.startswith('cuda'):
+                        self._compile_model(self.model)
+                
+                # Half precision halves weight/activation bandwidth and uses tensor cores; Ultralytics only supports it on CUDA
+                self.half = precision in ("fp16", "int8") and self.device.startswith('cuda')
+                if precision == "fp16" and not self.half and self.progress_callback:
+                    self.progress_callback(f"{self.status_symbols['warning']} FP16 precision requires a CUDA device, using FP32 on {self.device}")
+                if backend == "openvino" and exported_model_path:
+                    # Ultralytics compiles OpenVINO models when the predictor is created on the first predict,
+                    # picking a throughput hint only if that call's batch is > 1, so warm up with a full batch
+                    self._warmup_model(batch=YOLO_BATCH_SIZE)
+                    self._report_openvino_hint()
+                else:
+                    self._warmup_model()
                 if self.progress_callback:
                     self.progress_callback(f"{self.status_symbols['success']} YOLO model loaded successfully: {resolved_model_path}")
                 return True
@@ -234,12 +464,133 @@ class FaceDetectionProcessor:
                 self.progress_callback(f"{self.status_symbols['error']} Error loading model: {str(e)}")
             return False
     
-    def process_image(self, image_path: str, confidence_threshold: float = 0.5, save_results: bool = False, result_folder: str = None) -> List[Dict]:
+    def _compile_model(self, model):
+        """Wrap a loaded YOLO network in torch.compile to cut per-call Python/dispatch overhead"""
+        try:
+            if self.progress_callback:
+                self.progress_callback(f"{self.status_symbols['processing']} Compiling model with torch.compile (first inference will be slow)...")
+            # Ultralytics fuses Conv+BN on first predict; fuse now so the compiled graph sees the final layers.
+            # Compile forward() in place rather than wrapping the module, since the predictor re-fetches the
+            # module from fuse(), which would hand back the uncompiled original
+            network = model.model
+            network.fuse(verbose=False)
+            network.forward = torch.compile(network.forward, mode="reduce-overhead")
+        except Exception as e:
+            if self.progress_callback:
+                self.progress_callback(f"{self.status_symbols['warning']} torch.compile unavailable, using eager model: {str(e)}")
+    
+    def _warmup_model(self, batch: int = 1):
+        """Run dummy YOLO forward passes so the first real image doesn't pay for kernel setup"""
+        warmup_key = (self._loaded_model_path, self.device, self.half)
+        if self._warmed_up == warmup_key:
+            return
+        
+        try:
+            if self.progress_callback:
+                self.progress_callback(f"{self.status_symbols['processing']} Warming up model on {self.device}...")
+            self._run_warmup(self.model, batch)
+            self._warmed_up = warmup_key
+        except Exception as e:
+            # Warmup is only an optimisation; real inference reports its own errors
+            if self.progress_callback:
+                self.progress_callback(f"{self.status_symbols['warning']} Model warmup skipped: {str(e)}")
+    
+    def _run_warmup(self, model, batch: int = 1):
+        """Run WARMUP_ITERATIONS dummy forward passes through a YOLO model"""
+        dummy = np.zeros((YOLO_IMGSZ, YOLO_IMGSZ, 3), dtype=np.uint8)
+        for _ in range(WARMUP_ITERATIONS):
+            model.predict(source=dummy, half=self.half, verbose=False, batch=batch)
+    
+    def _report_openvino_hint(self):
+        """Report which OpenVINO performance hint the loaded model was compiled with"""
+        try:
+            hint = str(self.model.predictor.model.ov_compiled_model.get_property("PERFORMANCE_HINT"))
+        except Exception:
+            # Older/newer Ultralytics layouts; the hint is informational only
+            return
+        if self.progress_callback:
+            if "THROUGHPUT" in hint:
+                self.progress_callback(f"{self.status_symbols['info']} OpenVINO compiled with {hint} hint")
+            else:
+                self.progress_callback(f"{self.status_symbols['warning']} OpenVINO compiled with {hint} hint; this Ultralytics version does not use a throughput hint")
+    
+    def _get_model_replicas(self) -> List:
+        """Return the extra models used by concurrent CUDA stream workers, loading and warming them up on first use
+        
+        They stay cached until another model is loaded, so only runs that actually use the
+        stream workers pay for the extra GPU memory.
+        """
+        if self._model_replicas is not None:
+            return self._model_replicas
+        
+        # Ultralytics predictors are not thread-safe, so each extra worker needs its own model
+        self._model_replicas = []
+        exported = not self._loaded_model_path.endswith('.pt')
+        while len(self._model_replicas) < CUDA_STREAM_WORKERS - 1:
+            try:
+                if exported:
+                    # Exported engines are bound to their device at build time and cannot be moved with .to()
+                    replica = YOLO(self._loaded_model_path, task='detect')
+                else:
+                    # Never compiled: compiled runs do not use the stream workers (see _iter_image_detections)
+                    replica = YOLO(self._loaded_model_path).to(self.device)
+                self._run_warmup(replica)
+                self._model_replicas.append(replica)
+            except Exception as e:
+                if self.progress_callback:
+                    self.progress_callback(f"{self.status_symbols['warning']} Could not create extra YOLO worker: {str(e)}")
+                break
+        return self._model_replicas
+    
+    def _resize_for_yolo(self, image):
+        """Downscale a BGR image so its longest side matches the YOLO input size, returning (image, scale)"""
+        # Only downscale; Ultralytics letterboxes smaller images itself. Keep BGR order as Ultralytics expects for arrays.
+        height, width = image.shape[:2]
+        scale = min(1.0, YOLO_IMGSZ / max(height, width))
+        if scale < 1.0:
+            image = cv2.resize(image, (round(width * scale), round(height * scale)), interpolation=cv2.INTER_AREA)
+        return image, scale
+    
+    def _preprocess(self, image_path: str):
+        """Load an image downscaled to the YOLO input size, returning (image, scale) and caching recent results"""
+        try:
+            key = (image_path, os.stat(image_path).st_mtime_ns)
+        except OSError:
+            return None, 1.0
+        
+        with self._preprocess_lock:
+            cached = self._preprocess_cache.get(key)
+            if cached is not None:
+                self._preprocess_cache.move_to_end(key)
+                return cached
+        
+        image = cv2.imread(image_path)
+        if image is None:
+            return None, 1.0
+        image, scale = self._resize_for_yolo(image)
+        
+        with self._preprocess_lock:
+            self._preprocess_cache[key] = (image, scale)
+            if len(self._preprocess_cache) > PREPROCESS_CACHE_SIZE:
+                self._preprocess_cache.popitem(last=False)
+        return image, scale
+    
+    def process_image(self, image_path: str, confidence_threshold: float = 0.5, save_results: bool = False, result_folder: str = None, model=None) -> List[Dict]:
         """Process a single image for face detection"""
         try:
             # Load image
-            image = cv2.imread(image_path)
-            if image is None:
+            # When saving, YOLO is given the path so its artefacts are named after the file;
+            # Ultralytics decodes it itself, so skip our own decode and resize
+            yolo_reads_path = self.model_type == "YOLO" and save_results
+            if self.model_type == "RetinaFace":
+                image = cv2.imread(image_path)
+                scale = 1.0
+            elif yolo_reads_path:
+                image, scale = None, 1.0
+            else:
+                # YOLO gets a cached, pre-downscaled copy so repeated runs skip decode and resize
+                image, scale = self._preprocess(image_path)
+            if image is None and not yolo_reads_path:
                 raise ValueError(f"Could not load image: {image_path}")
             
             detections = []
@@ -247,7 +598,7 @@ class FaceDetectionProcessor:
             if self.model_type == "RetinaFace":
                 detections = self._process_with_retinaface(image, image_path, confidence_threshold, save_results, result_folder)
             else:
-                detections = self._process_with_yolo(image, image_path, confidence_threshold, save_results, result_folder)
+                detections = self._process_with_yolo(image, image_path, confidence_threshold, save_results, result_folder, scale, model)
             
             # Log completion of individual image processing
             if self.progress_callback:
@@ -264,8 +615,144 @@ class FaceDetectionProcessor:
                 self.progress_callback(f"{self.status_symbols['error']} Error processing {os.path.basename(image_path)}: {str(e)}")
             return []
     
-    def process_folder(self, folder_path: str, confidence_threshold: float = 0.5, model_name: str = "yolov8n.pt", save_results: bool = False, results_folder: str = None):
-        """Process all images and videos in a folder or single file"""
+    def _scan_media_files(self, folder_path: str, image_files: List[str], video_files: List[str]):
+        """Recursively collect image and video paths under folder_path, in os.walk order"""
+        # scandir returns file types with the directory listing, so no per-entry stat() is needed
+        subdirectories = []
+        try:
+            with os.scandir(folder_path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.path)
+                    elif entry.is_file():
+                        extension = os.path.splitext(entry.name)[1].lower()
+                        if extension in IMAGE_EXTENSIONS:
+                            image_files.append(entry.path)
+                        elif extension in VIDEO_EXTENSIONS:
+                            video_files.append(entry.path)
+        except OSError:
+            # Match os.walk, which skips directories it cannot list
+            return
+        
+        for subdirectory in subdirectories:
+            self._scan_media_files(subdirectory, image_files, video_files)
+    
+    def _detect_image(self, index: int, total: int, image_path: str, confidence_threshold: float, save_results: bool, result_folder: str, model=None) -> List[Dict]:
+        """Announce and run detection for one image of a folder run"""
+        if self.progress_callback:
+            self.progress_callback(f"{self.status_symbols['image']} Processing image {index+1}/{total}: {os.path.basename(image_path)}")
+        return self.process_image(image_path, confidence_threshold, save_results, result_folder, model)
+    
+    def _detect_batch(self, batch, total: int, confidence_threshold: float, save_results: bool, result_folder: str, model=None, loaded=None) -> List[List[Dict]]:
+        """Run detection for a batch of (index, image_path) pairs, using one batched YOLO call when possible"""
+        if self.model_type != "YOLO" or len(batch) == 1:
+            return [self._detect_image(i, total, image_path, confidence_threshold, save_results, result_folder, model)
+                    for i, image_path in batch]
+        
+        if save_results:
+            # Saved artefacts are named after each source, so Ultralytics gets the file paths and decodes them itself
+            image_paths = []
+            for i, image_path in batch:
+                if self.progress_callback:
+                    self.progress_callback(f"{self.status_symbols['image']} Processing image {i+1}/{total}: {os.path.basename(image_path)}")
+                image_paths.append(image_path)
+            detections = self._predict_yolo_batch(image_paths, image_paths, [1.0] * len(image_paths), confidence_threshold, model, result_folder)
+            if detections is None:
+                # One unreadable file fails the whole batched call; redo the batch per image so only that file is lost
+                return [self.process_image(image_path, confidence_threshold, save_results, result_folder, model)
+                        for _, image_path in batch]
+            return detections
+        
+        batch_detections = [[] for _ in batch]
+        loaded_slots, images, image_paths, scales = [], [], [], []
+        for slot, (i, image_path) in enumerate(batch):
+            if self.progress_callback:
+                self.progress_callback(f"{self.status_symbols['image']} Processing image {i+1}/{total}: {os.path.basename(image_path)}")
+            image, scale = loaded[slot] if loaded else self._preprocess(image_path)
+            if image is None:
+                if self.progress_callback:
+                    self.progress_callback(f"{self.status_symbols['error']} Error processing {os.path.basename(image_path)}: Could not load image: {image_path}")
+                continue
+            loaded_slots.append(slot)
+            images.append(image)
+            image_paths.append(image_path)
+            scales.append(scale)
+        
+        if images:
+            for slot, detections in zip(loaded_slots, self._predict_yolo_batch(images, image_paths, scales, confidence_threshold, model)):
+                batch_detections[slot] = detections
+        return batch_detections
+    
+    def _clamp_batch_size(self, batch_size: int) -> int:
+        """Limit a requested batch size to what the loaded model accepts"""
+        batch_size = max(1, batch_size)
+        if self._max_batch_size is not None and batch_size > self._max_batch_size:
+            if self.progress_callback:
+                self.progress_callback(f"{self.status_symbols['info']} Batch size {batch_size} exceeds the exported model's maximum, using {self._max_batch_size}")
+            return self._max_batch_size
+        return batch_size
+    
+    def _iter_image_detections(self, image_files: List[str], confidence_threshold: float, save_results: bool, result_folder: str, batch_size: int = YOLO_BATCH_SIZE):
+        """Yield (index, image_path, detections) in input order, batching YOLO calls and overlapping them on CUDA streams when possible"""
+        total = len(image_files)
+        indexed_files = list(enumerate(image_files))
+        batch_size = self._clamp_batch_size(batch_size)
+        batches = [indexed_files[start:start + batch_size] for start in range(0, total, batch_size)]
+        
+        # Concurrent predict calls would race on Ultralytics' shared save directory, so only run them when nothing is saved
+        # A torch.compile'd model's CUDA graphs are tied to the thread that captured them, so it stays on this thread
+        use_streams = (self.model_type == "YOLO" and self.device.startswith('cuda') and
+                       not save_results and len(batches) > 1 and os.environ.get("FACE_TORCH_COMPILE") != "1")
+        if not use_streams:
+            # Decode the next batch on a thread pool while the current one runs inference. cv2.imread/resize
+            # release the GIL, so the images of a batch decode in parallel and overlap with compute. The model
+            # itself is only ever called from this thread, since Ultralytics predictors are not thread-safe.
+            prefetch = self.model_type == "YOLO" and not save_results and len(batches) > 1
+            loader = ThreadPoolExecutor(max_workers=DECODE_WORKERS) if prefetch else None
+            try:
+                next_loaded = [loader.submit(self._preprocess, image_path) for _, image_path in batches[0]] if loader else None
+                for k, batch in enumerate(batches):
+                    if not self.is_processing:
+                        return
+                    loaded = None
+                    if loader:
+                        loaded = [future.result() for future in next_loaded]
+                        if k + 1 < len(batches):
+                            next_loaded = [loader.submit(self._preprocess, image_path) for _, image_path in batches[k + 1]]
+                    batch_detections = self._detect_batch(batch, total, confidence_threshold, save_results, result_folder, loaded=loaded)
+                    for (i, image_path), detections in zip(batch, batch_detections):
+                        yield i, image_path, detections
+            finally:
+                if loader:
+                    loader.shutdown(wait=True, cancel_futures=True)
+            return
+        
+        # Ultralytics predictors are not thread-safe, so each worker borrows its own model replica and stream
+        workers = queue.Queue()
+        for model in [self.model] + self._get_model_replicas():
+            workers.put((model, torch.cuda.Stream()))
+        
+        def run(batch):
+            if not self.is_processing:
+                return [[] for _ in batch]
+            model, stream = workers.get()
+            try:
+                with torch.cuda.stream(stream):
+                    return self._detect_batch(batch, total, confidence_threshold, save_results, result_folder, model)
+            finally:
+                workers.put((model, stream))
+        
+        executor = ThreadPoolExecutor(max_workers=workers.qsize())
+        try:
+            futures = [executor.submit(run, batch) for batch in batches]
+            for batch, future in zip(batches, futures):
+                for (i, image_path), detections in zip(batch, future.result()):
+                    yield i, image_path, detections
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def process_folder(self, folder_path: str, confidence_threshold: float = 0.5, model_name: str = "yolov8n.pt", save_results: bool = False, results_folder: str = None, batch_size: int = YOLO_BATCH_SIZE, precision: str = "fp32", files: Optional[List[str]] = None):
+        """Process all images and videos in a folder or single file, or only the given list of files"""
         self.is_processing = True
         self.results = []
         # Store confidence threshold for summary export
@@ -306,31 +793,25 @@ class FaceDetectionProcessor:
             # Load the specified model
             if self.progress_callback:
                 self.progress_callback(f"{self.status_symbols['info']} Loading model: {model_name}...")
-            if not self.load_model(model_name):
+            if not self.load_model(model_name, precision):
                 return
             
             # Get all image and video files
-            image_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.tiff']
-            video_extensions = ['.mp4', '.avi', '.mov']
             image_files = []
             video_files = []
             
-            # Check if the path is a file or directory
-            if os.path.isfile(folder_path):
-                # Single file processing
-                if any(folder_path.lower().endswith(ext) for ext in image_extensions):
-                    image_files.append(folder_path)
-                elif any(folder_path.lower().endswith(ext) for ext in video_extensions):
-                    video_files.append(folder_path)
+            # Check if explicit files were given, or whether the path is a file or directory
+            if files is not None or os.path.isfile(folder_path):
+                # Explicit file list (sent as one batch) or single file processing
+                for file_path in (files if files is not None else [folder_path]):
+                    extension = os.path.splitext(file_path)[1].lower()
+                    if extension in IMAGE_EXTENSIONS:
+                        image_files.append(file_path)
+                    elif extension in VIDEO_EXTENSIONS:
+                        video_files.append(file_path)
             else:
                 # Directory processing
-                for root, _, files in os.walk(folder_path):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        if any(file.lower().endswith(ext) for ext in image_extensions):
-                            image_files.append(file_path)
-                        elif any(file.lower().endswith(ext) for ext in video_extensions):
-                            video_files.append(file_path)
+                self._scan_media_files(folder_path, image_files, video_files)
             
             total_files = len(image_files) + len(video_files)
             if total_files == 0:
@@ -342,17 +823,11 @@ class FaceDetectionProcessor:
                 self.progress_callback(f"{self.status_symbols['folder']} Found {len(image_files)} images and {len(video_files)} videos to process")
             
             # Process each image
-            for i, image_path in enumerate(image_files):
+            for i, image_path, detections in self._iter_image_detections(image_files, confidence_threshold, save_results, result_folder, batch_size):
                 if not self.is_processing:
-                    if self.progress_callback:
-                        self.progress_callback(f"{self.status_symbols['warning']} Processing stopped by user")
                     break
-                    
-                if self.progress_callback:
-                    self.progress_callback(f"{self.status_symbols['image']} Processing image {i+1}/{len(image_files)}: {os.path.basename(image_path)}")
                 
                 try:
-                    detections = self.process_image(image_path, confidence_threshold, save_results, result_folder)
                     if detections:
                         self.results.extend(detections)
                         if self.progress_callback:
@@ -383,6 +858,9 @@ class FaceDetectionProcessor:
                         self.progress_callback(f"{self.status_symbols['error']} Failed to process {os.path.basename(image_path)}: {str(image_error)}")
                     continue  # Continue with next image
             
+            if not self.is_processing and self.progress_callback:
+                self.progress_callback(f"{self.status_symbols['warning']} Processing stopped by user")
+            
             # Process each video
             for i, video_path in enumerate(video_files):
                 if not self.is_processing:
@@ -392,7 +870,7 @@ class FaceDetectionProcessor:
                     self.progress_callback(f"{self.status_symbols['video']} Processing video {i+1}/{len(video_files)}: {os.path.basename(video_path)}")
                 
                 if result_folder:
-                    video_detections = self.process_video(video_path, confidence_threshold, result_folder)
+                    video_detections = self.process_video(video_path, confidence_threshold, result_folder, batch_size)
                     self.results.extend(video_detections)
             
             # Export results to CSV if saving results
@@ -448,6 +926,34 @@ class FaceDetectionProcessor:
                     'results_count': len(self.results)
                 })
     
+    def unload_model(self) -> bool:
+        """Release the loaded model and cached inputs so another model can be loaded in this process"""
+        if self.is_processing:
+            if self.progress_callback:
+                self.progress_callback(f"{self.status_symbols['warning']} Cannot unload the model while processing is running")
+            return False
+        
+        self.model = None
+        self._model_replicas = None
+        self._max_batch_size = None
+        self._retinaface_model = None
+        self._loaded_model_path = None
+        self._warmed_up = None
+        self.current_model_path = None
+        self.device = 'cpu'
+        self.half = False
+        with self._preprocess_lock:
+            self._preprocess_cache.clear()
+        
+        # Free the weights now and hand cached GPU blocks back to the driver
+        gc.collect()
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        
+        if self.progress_callback:
+            self.progress_callback(f"{self.status_symbols['info']} Model unloaded")
+        return True
+    
     def stop_processing(self):
         """Stop the current processing"""
         self.is_processing = False
@@ -458,20 +964,129 @@ class FaceDetectionProcessor:
         """Get the current results"""
         return self.results
     
-    def _process_with_yolo(self, image, image_path: str, confidence_threshold: float, save_results: bool, result_folder: str) -> List[Dict]:
-        """Process image with YOLO model"""
+    def _extract_yolo_detections(self, result, image_path: str, scale: float = 1.0) -> List[Dict]:
+        """Convert one Ultralytics result into detection dicts in original image pixels"""
+        if result.boxes is None or len(result.boxes) == 0:
+            return []
+        
+        # One device->host copy of the packed (N, 6) [x1, y1, x2, y2, conf, cls] tensor
+        data = result.boxes.data.cpu().numpy()
+        boxes = data[:, :4] / scale  # Bounding boxes in xyxy format, in original image pixels
+        
+        # Convert to center coordinates and width/height (like the old method) for
+        # all boxes at once, then hand plain Python floats to the dict builder
+        sizes = boxes[:, 2:] - boxes[:, :2]
+        centers = boxes[:, :2] + sizes / 2
+        rows = np.column_stack((centers, sizes, data[:, 4])).tolist()
+        
+        detections = [
+            {
+                'x': x_center,
+                'y': y_center,
+                'width': width,
+                'height': height,
+                'confidence': confidence,
+                'image_path': image_path
+            }
+            for x_center, y_center, width, height, confidence in rows
+        ]
+        return detections
+    
+    def _predict_yolo_batch(self, images, image_paths: List[str], scales: List[float], confidence_threshold: float, model=None, result_folder: str = None) -> Optional[List[List[Dict]]]:
+        """Run one batched YOLO forward pass over pre-resized images and return detections per image
+        
+        With a result_folder, images are file paths and the annotated images and labels are saved there;
+        a failed call then returns None so the caller can retry per image.
+        """
+        model = model or self.model
+        save_results = result_folder is not None
+        try:
+            if save_results:
+                results = model.predict(
+                    source=images,
+                    conf=confidence_threshold,
+                    half=self.half,
+                    verbose=False,
+                    save=True,
+                    save_txt=True,
+                    save_conf=True,
+                    project=self._get_runs_dir(),
+                    name="predict",
+                    exist_ok=True
+                )
+            else:
+                results = model.predict(source=images, conf=confidence_threshold, half=self.half, verbose=False)
+        except Exception as e:
+            if self.progress_callback:
+                self.progress_callback(f"{self.status_symbols['error']} Batched YOLO inference failed: {str(e)}")
+            return None if save_results else [[] for _ in images]
+        
+        if save_results and results and results[0].save_dir:
+            self._move_yolo_results(results[0].save_dir, result_folder)
+        
+        batch_detections = []
+        for result, image_path, scale in zip(results, image_paths, scales):
+            detections = self._extract_yolo_detections(result, image_path, scale)
+            if self.progress_callback:
+                if detections:
+                    self.progress_callback(f"{self.status_symbols['face']} Found {len(detections)} face(s) in {os.path.basename(image_path)}")
+                else:
+                    self.progress_callback(f"{self.status_symbols['complete']} No faces detected in {os.path.basename(image_path)}")
+            batch_detections.append(detections)
+        return batch_detections
+    
+    def _get_runs_dir(self) -> str:
+        """Writable project directory for Ultralytics' run output (avoids the default './runs' on read-only filesystems)"""
+        runs_project_dir = os.path.join(self._get_model_dir(), "runs")
+        os.makedirs(runs_project_dir, exist_ok=True)
+        return runs_project_dir
+    
+    def _move_yolo_results(self, yolo_result_dir: str, result_folder: str):
+        """Move the contents of an Ultralytics run directory into result_folder/results and remove the run directory"""
         import shutil
         
+        if self.progress_callback:
+            self.progress_callback(f"{self.status_symbols['folder']} Results saved to {yolo_result_dir}")
+        
+        for item in os.listdir(yolo_result_dir):
+            s = os.path.join(yolo_result_dir, item)
+            d = os.path.join(result_folder, "results", item)
+            if os.path.isdir(s):
+                if os.path.exists(d):
+                    shutil.rmtree(d)
+                shutil.move(s, d)
+            else:
+                if os.path.exists(d):
+                    os.remove(d)
+                shutil.move(s, d)
+        
+        # Delete original YOLO results directory
+        shutil.rmtree(yolo_result_dir)
+        
+        if self.progress_callback:
+            self.progress_callback(f"{self.status_symbols['complete']} Results copied to final location")
+    
+    def _process_with_yolo(self, image, image_path: str, confidence_threshold: float, save_results: bool, result_folder: str, scale: float = 1.0, model=None) -> List[Dict]:
+        """Process image with YOLO model (or the given model replica)"""
+        model = model or self.model
+        
         if self.progress_callback:
             self.progress_callback(f"{self.status_symbols['processing']} Running YOLO inference on {os.path.basename(image_path)}...")
         
+        # Saved artefacts are named after the source file, so only feed the
+        # pre-downscaled array when nothing is written to disk
+        if save_results:
+            source = image_path
+            scale = 1.0
+        else:
+            source = image
+        
         # Run inference using predict method (like old_script.py)
-        # Ensure Ultralytics writes to a writable directory (avoid default './runs' in read-only filesystems)
-        runs_project_dir = os.path.join(self._get_model_dir(), "runs")
-        os.makedirs(runs_project_dir, exist_ok=True)
-        results = self.model.predict(
-            source=image_path,
+        runs_project_dir = self._get_runs_dir()
+        results = model.predict(
+            source=source,
             conf=confidence_threshold,
+            half=self.half,
             save=save_results,
             save_txt=save_results,
             save_conf=save_results,
@@ -485,27 +1100,7 @@ class FaceDetectionProcessor:
         
         # Copy results to the result folder if save_results is True
         if results and results[0].save_dir and save_results and result_folder:
-            yolo_result_dir = results[0].save_dir
-            if self.progress_callback:
-                self.progress_callback(f"{self.status_symbols['folder']} Results saved to {yolo_result_dir}")
-            
-            for item in os.listdir(yolo_result_dir):
-                s = os.path.join(yolo_result_dir, item)
-                d = os.path.join(result_folder, "results", item)
-                if os.path.isdir(s):
-                    if os.path.exists(d):
-                        shutil.rmtree(d)
-                    shutil.move(s, d)
-                else:
-                    if os.path.exists(d):
-                        os.remove(d)
-                    shutil.move(s, d)
-            
-            # Delete original YOLO results directory
-            shutil.rmtree(yolo_result_dir)
-            
-            if self.progress_callback:
-                self.progress_callback(f"{self.status_symbols['complete']} Results copied to final location")
+            self._move_yolo_results(results[0].save_dir, result_folder)
         
         # Extract face detections from the YOLO results
         detections = []
@@ -517,33 +1112,11 @@ class FaceDetectionProcessor:
             
             # Get detections directly from YOLO results object
             result = results[0]
-            if self.progress_callback:
-                self.progress_callback(f"{self.status_symbols['info']} DEBUG: result.boxes = {result.boxes}")
-                if result.boxes is not None:
-                    self.progress_callback(f"{self.status_symbols['info']} DEBUG: len(result.boxes) = {len(result.boxes)}")
+            # Debug output is lazy: formatting result.boxes prints its tensors, which copies them off the GPU
+            logger.debug("result.boxes = %s", result.boxes)
             
             if result.boxes is not None and len(result.boxes) > 0:
-                boxes = result.boxes.xyxy.cpu().numpy()  # Get bounding boxes in xyxy format
-                confidences = result.boxes.conf.cpu().numpy()  # Get confidences
-                
-                for i in range(len(boxes)):
-                    x1, y1, x2, y2 = boxes[i]
-                    confidence = confidences[i]
-                    
-                    # Convert to center coordinates and width/height (like the old method)
-                    width = x2 - x1
-                    height = y2 - y1
-                    x_center = x1 + width / 2
-                    y_center = y1 + height / 2
-                    
-                    detections.append({
-                        'x': float(x_center),
-                        'y': float(y_center),
-                        'width': float(width),
-                        'height': float(height),
-                        'confidence': float(confidence),
-                        'image_path': image_path
-                    })
+                detections = self._extract_yolo_detections(result, image_path, scale)
                     
                 if self.progress_callback:
                     self.progress_callback(f"{self.status_symbols['face']} Extracted {len(detections)} face detections from YOLO results")
@@ -584,7 +1157,7 @@ class FaceDetectionProcessor:
         # Log completion of YOLO processing
         if self.progress_callback:
             self.progress_callback(f"{self.status_symbols['complete']} YOLO processing completed for {os.path.basename(image_path)} - found {len(detections)} faces")
-            self.progress_callback(f"{self.status_symbols['info']} DEBUG: Returning detections: {detections}")
+        logger.debug("Returning detections: %s", detections)
         
         return detections
     
@@ -599,39 +1172,39 @@ class FaceDetectionProcessor:
             # Import locally to avoid NameError when global import is unavailable
             from retinaface import RetinaFace as _RetinaFace
             
-            # Use RetinaFace for detection - it expects image path or numpy array
-            face_detections = _RetinaFace.detect_faces(image_path, threshold=confidence_threshold)
+            # Pass the already-decoded BGR array rather than the path so RetinaFace does not read
+            # the file a second time; a C-contiguous buffer avoids another copy inside its preprocessing
+            face_detections = _RetinaFace.detect_faces(np.ascontiguousarray(image), threshold=confidence_threshold, model=self._retinaface_model)
             
             if self.progress_callback:
                 self.progress_callback(f"{self.status_symbols['success']} RetinaFace inference completed for {os.path.basename(image_path)}")
             
             if face_detections:
-                result_img = image.copy() if save_results else None
+                # Gather all faces into (N, 4) box and (N,) score arrays in one pass;
+                # RetinaFace returns coordinates as [x1, y1, x2, y2]
+                faces = face_detections.values()
+                boxes = np.asarray([face["facial_area"] for face in faces], dtype=np.int32).reshape(-1, 4)
+                scores = np.asarray([face["score"] for face in faces], dtype=np.float32)
+                widths = boxes[:, 2] - boxes[:, 0]
+                heights = boxes[:, 3] - boxes[:, 1]
                 
-                for key, detection in face_detections.items():
-                    facial_area = detection["facial_area"]
-                    confidence = detection["score"]
-                    
-                    # RetinaFace returns coordinates as [x1, y1, x2, y2]
-                    x1, y1, x2, y2 = facial_area
-                    x = x1
-                    y = y1
-                    w = x2 - x1
-                    h = y2 - y1
-                    
+                for (x, y), w, h, confidence in zip(boxes[:, :2].tolist(), widths.tolist(), heights.tolist(), scores.tolist()):
                     detections.append({
                         'x': float(x),
                         'y': float(y),
                         'width': float(w),
                         'height': float(h),
-                        'confidence': float(confidence),
+                        'confidence': confidence,
                         'image_path': image_path
                     })
-                    
-                    # Draw bounding box for visualization
-                    if save_results and result_img is not None:
-                        cv2.rectangle(result_img, (int(x), int(y)), (int(x + w), int(y + h)), (0, 255, 0), 2)
-                        cv2.putText(result_img, f"{confidence:.3f}", (int(x), int(y - 5)), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+                
+                # Draw bounding boxes for visualization
+                result_img = None
+                if save_results:
+                    result_img = image.copy()
+                    for (x1, y1, x2, y2), confidence in zip(boxes.tolist(), scores.tolist()):
+                        cv2.rectangle(result_img, (x1, y1), (x2, y2), (0, 255, 0), 2)
+                        cv2.putText(result_img, f"{confidence:.3f}", (x1, y1 - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
                 
                 # Save result image
                 if save_results and result_img is not None and result_folder:
@@ -677,68 +1250,173 @@ class FaceDetectionProcessor:
             if self.progress_callback:
                 self.progress_callback(f"{self.status_symbols['error']} Error saving result image: {str(e)}")
     
-    def process_video(self, video_path: str, confidence_threshold: float = 0.5, result_folder: str = None) -> List[Dict]:
+    def _open_video(self, video_path: str):
+        """Open a video for frame sampling, returning (reader, frame_count, fps)
+        
+        FACE_VIDEO_BACKEND=decord uses decord's VideoReader (on the GPU via NVDEC when CUDA is
+        available), which seeks straight to sampled frames; otherwise OpenCV is used.
+        """
+        if os.environ.get("FACE_VIDEO_BACKEND", "opencv").lower() == "decord":
+            try:
+                import decord
+                use_gpu = _import_yolo() and torch.cuda.is_available()
+                reader = decord.VideoReader(video_path, ctx=decord.gpu(0) if use_gpu else decord.cpu(0))
+                if self.progress_callback:
+                    self.progress_callback(f"{self.status_symbols['info']} Decoding video with decord ({'GPU' if use_gpu else 'CPU'})")
+                return reader, len(reader), reader.get_avg_fps()
+            except Exception as e:
+                if self.progress_callback:
+                    self.progress_callback(f"{self.status_symbols['warning']} decord unavailable, decoding with OpenCV: {str(e)}")
+        
+        cap = cv2.VideoCapture(video_path)
+        return cap, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), cap.get(cv2.CAP_PROP_FPS)
+    
+    def _iter_sampled_frames(self, cap, frames_to_skip: int):
+        """Yield (frame_idx, frame) for every frames_to_skip-th frame of an open video reader"""
+        if not isinstance(cap, cv2.VideoCapture):
+            # decord reader: fetch only the sampled indices, a few at a time, converting RGB to OpenCV's BGR
+            sampled_indices = range(0, len(cap), frames_to_skip)
+            for start in range(0, len(sampled_indices), YOLO_BATCH_SIZE):
+                indices = list(sampled_indices[start:start + YOLO_BATCH_SIZE])
+                frames = cap.get_batch(indices).asnumpy()
+                for frame_idx, frame in zip(indices, frames):
+                    yield frame_idx, np.ascontiguousarray(frame[..., ::-1])
+            return
+        
+        # Decode sequentially: grab() advances past skipped frames without copying
+        # their pixels out, and only sampled frames are retrieve()d
+        frame_idx = -1
+        while True:
+            if frames_to_skip == 1:
+                ret, frame = cap.read()
+                frame_idx += 1
+            else:
+                if not cap.grab():
+                    return
+                frame_idx += 1
+                if frame_idx % frames_to_skip:
+                    continue
+                ret, frame = cap.retrieve()
+            if not ret:
+                return
+            yield frame_idx, frame
+    
+    def _iter_in_background(self, iterable, max_pending: int):
+        """Yield items from an iterable that is drained on a background thread, keeping at most max_pending queued"""
+        items = queue.Queue(maxsize=max_pending)
+        stop = threading.Event()
+        end = object()
+        
+        def put(item):
+            # Time out periodically so the producer notices when the consumer has gone away
+            while not stop.is_set():
+                try:
+                    items.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        
+        def produce():
+            try:
+                for item in iterable:
+                    if not put((True, item)):
+                        return
+            except Exception as e:
+                put((False, e))
+            finally:
+                put((True, end))
+        
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        try:
+            while True:
+                ok, item = items.get()
+                if not ok:
+                    raise item
+                if item is end:
+                    return
+                yield item
+        finally:
+            stop.set()
+            producer.join()
+    
+    def _detect_video_frames(self, frames, scales: List[float], frame_paths: List[str], confidence_threshold: float) -> List[List[Dict]]:
+        """Detect faces in a batch of in-memory video frames labelled with per-frame paths"""
+        if self.model_type == "YOLO":
+            return self._predict_yolo_batch(frames, frame_paths, scales, confidence_threshold)
+        
+        # RetinaFace takes the decoded frame directly; the frame path only labels its detections
+        return [self._process_with_retinaface(frame, frame_path, confidence_threshold, False, None)
+                for frame, frame_path in zip(frames, frame_paths)]
+    
+    def process_video(self, video_path: str, confidence_threshold: float = 0.5, result_folder: str = None, batch_size: int = YOLO_BATCH_SIZE) -> List[Dict]:
         """Process video for face detection by sampling frames"""
         try:
             if self.progress_callback:
                 self.progress_callback(f"{self.status_symbols['video']} Processing video: {os.path.basename(video_path)}")
             
-            cap = cv2.VideoCapture(video_path)
-            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            fps = cap.get(cv2.CAP_PROP_FPS)
+            cap, frame_count, fps = self._open_video(video_path)
             duration = frame_count / fps
             
             # Calculate frames to skip (1 frame per second)
-            frames_to_skip = int(fps)
+            frames_to_skip = max(1, int(fps))
+            total_sampled_frames = max(1, frame_count // frames_to_skip)
+            batch_size = self._clamp_batch_size(batch_size)
             
             frames_with_faces = 0
             processed_frames = 0
             all_detections = []
             
-            for frame_idx in range(0, frame_count, frames_to_skip):
-                if not self.is_processing:
-                    break
-                    
-                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-                ret, frame = cap.read()
-                if not ret:
+            # Run detection on batches of sampled frames (the last batch may be partial) while a
+            # background thread decodes the following frames, so decode overlaps with inference
+            decoded_frames = self._iter_sampled_frames(cap, frames_to_skip)
+            if self.model_type == "YOLO":
+                # Downscale to the model input size on the decoder thread, so only small frames are queued
+                decoded_frames = ((frame_idx,) + self._resize_for_yolo(frame) for frame_idx, frame in decoded_frames)
+            else:
+                decoded_frames = ((frame_idx, frame, 1.0) for frame_idx, frame in decoded_frames)
+            sampled_frames = self._iter_in_background(decoded_frames, 2 * batch_size)
+            while self.is_processing:
+                pending_frames = list(itertools.islice(sampled_frames, batch_size))
+                if not pending_frames:
                     break
                 
-                processed_frames += 1
-                
-                # Save frame temporarily
-                temp_frame_path = os.path.join(result_folder, f'temp_frame_{frame_idx}.jpg')
-                cv2.imwrite(temp_frame_path, frame)
-                
-                # Process frame
-                detections = self.process_image(temp_frame_path, confidence_threshold, save_results=False)
-                
-                # Clean up temp frame
-                os.remove(temp_frame_path)
+                frame_indices = [frame_idx for frame_idx, _, _ in pending_frames]
+                frame_paths = [os.path.join(result_folder, f'temp_frame_{frame_idx}.jpg') for frame_idx in frame_indices]
+                batch_detections = self._detect_video_frames([frame for _, frame, _ in pending_frames],
+                                                             [scale for _, _, scale in pending_frames],
+                                                             frame_paths, confidence_threshold)
                 
-                if detections:
-                    frames_with_faces += 1
-                    for detection in detections:
-                        detection['frame_idx'] = frame_idx
-                        detection['timestamp'] = frame_idx / fps
-                    all_detections.extend(detections)
-                
-                # Emit per-frame completion event
-                if self.completion_callback:
-                    frame_progress = (processed_frames / (frame_count // frames_to_skip)) * 100
-                    self.completion_callback({
-                        'status': 'frame_completed',
-                        'frame_index': frame_idx,
-                        'processed_frames': processed_frames,
-                        'total_frames': frame_count // frames_to_skip,
-                        'progress_percent': frame_progress,
-                        'detections_in_frame': len(detections) if detections else 0,
-                        'total_detections': len(all_detections),
-                        'timestamp': frame_idx / fps,
-                        'video_path': os.path.basename(video_path)
-                    })
+                for frame_idx, detections in zip(frame_indices, batch_detections):
+                    processed_frames += 1
+                    
+                    if detections:
+                        frames_with_faces += 1
+                        for detection in detections:
+                            detection['frame_idx'] = frame_idx
+                            detection['timestamp'] = frame_idx / fps
+                        all_detections.extend(detections)
+                    
+                    # Emit per-frame completion event
+                    if self.completion_callback:
+                        frame_progress = (processed_frames / total_sampled_frames) * 100
+                        self.completion_callback({
+                            'status': 'frame_completed',
+                            'frame_index': frame_idx,
+                            'processed_frames': processed_frames,
+                            'total_frames': frame_count // frames_to_skip,
+                            'progress_percent': frame_progress,
+                            'detections_in_frame': len(detections) if detections else 0,
+                            'total_detections': len(all_detections),
+                            'timestamp': frame_idx / fps,
+                            'video_path': os.path.basename(video_path)
+                        })
             
-            cap.release()
+            # Stop the decoder thread before releasing the capture it reads from
+            sampled_frames.close()
+            if isinstance(cap, cv2.VideoCapture):
+                cap.release()
             
             face_percentage = (frames_with_faces / processed_frames) * 100 if processed_frames > 0 else 0
             
@@ -760,38 +1438,37 @@ class FaceDetectionProcessor:
                     self.progress_callback(f"{self.status_symbols['warning']} No results to export")
                 return False
             
-            # Group results by image
-            image_results = {}
+            # Group results by image in one pass, flattening each face's fields straight into a per-image value list
+            # Track the widest row while grouping instead of walking every group again afterwards
+            image_values = {}
+            max_values = 0
             for detection in results:
-                image_path = detection['image_path']
-                if image_path not in image_results:
-                    image_results[image_path] = []
-                image_results[image_path].append(detection)
+                values = image_values.get(detection['image_path'])
+                if values is None:
+                    values = image_values[detection['image_path']] = []
+                values.extend((detection['x'], detection['y'], detection['width'], detection['height'], detection['confidence']))
+                if len(values) > max_values:
+                    max_values = len(values)
             
             # Prepare CSV data
             csv_data = []
-            max_faces = max(len(detections) for detections in image_results.values())
+            max_faces = max_values // 5
             
             # Create headers
             headers = ['filename', 'face_detected', 'face_count']
             for i in range(max_faces):
                 headers.extend([f'face_{i+1}_x', f'face_{i+1}_y', f'face_{i+1}_width', f'face_{i+1}_height', f'face_{i+1}_confidence'])
             
-            # Create rows
-            for image_path, detections in image_results.items():
-                row = [os.path.basename(image_path), 1 if detections else 0, len(detections)]
-                
-                for detection in detections:
-                    row.extend([detection['x'], detection['y'], detection['width'], detection['height'], detection['confidence']])
-                
-                # Pad row to match headers length
-                while len(row) < len(headers):
-                    row.append('')
-                
+            # Create rows, padded to the header length in a single extend
+            row_width = len(headers)
+            for image_path, values in image_values.items():
+                row = [os.path.basename(image_path), 1 if values else 0, len(values) // 5]
+                row.extend(values)
+                row.extend([''] * (row_width - len(row)))
                 csv_data.append(row)
             
-            # Write CSV file
-            with open(output_path, 'w', newline='') as csvfile:
+            # Write CSV file through a large buffer so big result sets are flushed in few write calls
+            with open(output_path, 'w', newline='', buffering=CSV_WRITE_BUFFER_SIZE) as csvfile:
                 writer = csv.writer(csvfile)
                 writer.writerow(headers)
                 writer.writerows(csv_data)
@@ -915,14 +1592,7 @@ class FaceDetectionProcessor:
             
             # Always include YOLO models if YOLO environment exists
             if has_yolo_env:
-                models.extend([
-                    "yolov8n-face.pt",
-                    "yolov8m-face.pt", 
-                    "yolov8l-face.pt",
-                    "yolov11m-face.pt",
-                    "yolov11l-face.pt",
-                    "yolov12l-face.pt"
-                ])
+                models.extend(YOLO_FACE_MODELS)
                 print(f"YOLO environment detected at {yolo_env_path}, adding YOLO models", file=sys.stderr)
             
             # Always include RetinaFace if RetinaFace environment exists
@@ -932,14 +1602,7 @@ class FaceDetectionProcessor:
         else:
             # Single environment mode - only show models for available frameworks
             if YOLO_AVAILABLE:
-                models.extend([
-                    "yolov8n-face.pt",
-                    "yolov8m-face.pt", 
-                    "yolov8l-face.pt",
-                    "yolov11m-face.pt",
-                    "yolov11l-face.pt",
-                    "yolov12l-face.pt"
-                ])
+                models.extend(YOLO_FACE_MODELS)
             
             if RETINAFACE_AVAILABLE:
                 models.append("RetinaFace")
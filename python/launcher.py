@@ -5,7 +5,7 @@ Sets up the Python path to include bundled dependencies before running the main
 """
 import sys
 import os
-import json
+from multi_env_launcher import send_error
 
 def setup_python_path():
     """Add bundled dependencies to Python path"""
@@ -49,6 +49,7 @@ def setup_python_path():
 
 def main():
     """Main entry point - setup path and run subprocess API"""
+    protocol_out = None
     try:
         # Setup Python path for bundled dependencies
         setup_python_path()
@@ -61,25 +62,20 @@ def main():
         # Import here after path is set up
         import subprocess_api
         
+        # Claim the protocol stream before building the API, so errors raised while building it still reach Electron
+        protocol_out = subprocess_api.get_protocol_out()
+        
         # Create and run the API
         api = subprocess_api.SubprocessAPI()
         api.run()
         
     except ImportError as e:
-        error_msg = {
-            "type": "error",
-            "message": f"Failed to import subprocess_api: {str(e)}"
-        }
-        print(json.dumps(error_msg))
+        send_error(f"Failed to import subprocess_api: {str(e)}", protocol_out)
         sys.stderr.write(f"Import error: {e}\n")
         sys.stderr.write(f"Python path: {sys.path}\n")
         sys.exit(1)
     except Exception as e:
-        error_msg = {
-            "type": "error", 
-            "message": f"Launcher error: {str(e)}"
-        }
-        print(json.dumps(error_msg))
+        send_error(f"Launcher error: {str(e)}", protocol_out)
         sys.stderr.write(f"Launcher error: {e}\n")
         sys.exit(1)
 
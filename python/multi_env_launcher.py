@@ -6,19 +6,59 @@ Dynamically switches between YOLO and RetinaFace environments based on model sel
 import sys
 import os
 import json
+import importlib
+import importlib.metadata
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+
+# Top-level packages whose already-imported modules must be dropped when switching environments
+CONFLICTING_PACKAGES = frozenset({'numpy', 'torch', 'tensorflow', 'cv2', 'ultralytics'})
+
+# (display name, module, distribution names) checked at startup for each environment.
+# Versions are read from package metadata so the check does not import the heavy frameworks;
+# modules with no distribution names listed are imported, because their presence is what matters.
+YOLO_DEPENDENCIES = [('PyTorch', 'torch', ('torch',)), ('Ultralytics', 'ultralytics', ('ultralytics',))]
+RETINAFACE_DEPENDENCIES = [('TensorFlow', 'tensorflow', ('tensorflow', 'tensorflow-macos')),
+                           ('RetinaFace', 'retinaface', ('retina-face',))]
+COMMON_DEPENDENCIES = [('OpenCV', 'cv2', ()), ('NumPy', 'numpy', ('numpy',))]
+
+def is_development_mode(script_dir):
+    """Development mode: script_dir is the source python/ directory; packaged mode: pythondist/python/ in the app bundle"""
+    return (os.path.exists(os.path.join(script_dir, '../src')) or 
+            (os.path.basename(script_dir) == 'python' and 
+             os.path.basename(os.path.dirname(script_dir)) != 'pythondist'))
+
+# Launcher location and bundled environment paths, resolved once at import
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT_DIR = os.path.dirname(SCRIPT_DIR)
+ENV_DIRS = {
+    'yolo': os.path.join(PARENT_DIR, 'yolo-env'),
+    'retinaface': os.path.join(PARENT_DIR, 'retinaface-env'),
+}
+IS_DEVELOPMENT = is_development_mode(SCRIPT_DIR)
+
+def get_env_dir(model_type):
+    """Bundled environment directory for a model type (YOLO for anything unrecognised)"""
+    return ENV_DIRS.get(model_type, ENV_DIRS['yolo'])
+
+def configure_gpu_allocators():
+    """Set GPU allocator options before torch/TensorFlow are imported (user-provided values win)
+    
+    PyTorch's caching allocator with expandable segments serves allocations across model
+    switches without cudaMalloc/cudaFree round-trips or fragmentation; TensorFlow is told to
+    grow its GPU pool on demand instead of reserving all device memory up front.
+    """
+    os.environ.setdefault('PYTORCH_CUDA_ALLOC_CONF', 'expandable_segments:True')
+    os.environ.setdefault('TF_FORCE_GPU_ALLOW_GROWTH', 'true')
 
 def setup_python_path(model_type='yolo'):
     """Add bundled dependencies to Python path based on model type"""
     # Get the directory where this launcher script is located
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    parent_dir = os.path.dirname(script_dir)
+    script_dir = SCRIPT_DIR
+    parent_dir = PARENT_DIR
     
     # Check if we're in development mode (source files) or packaged mode
-    # Development mode: script_dir is in the source python/ directory 
-    # Packaged mode: script_dir is in pythondist/python/ inside app bundle
-    is_development = (os.path.exists(os.path.join(script_dir, '../src')) or 
-                     (os.path.basename(script_dir) == 'python' and 
-                      os.path.basename(os.path.dirname(script_dir)) != 'pythondist'))
+    is_development = IS_DEVELOPMENT
     
     print(f"Environment Detection:", file=sys.stderr)
     print(f"  Script directory: {script_dir}", file=sys.stderr)
@@ -45,10 +85,7 @@ def setup_python_path(model_type='yolo'):
             sys.path.insert(0, script_dir)
         
         # Determine the appropriate environment directory
-        if model_type == 'retinaface':
-            env_dir = os.path.join(parent_dir, 'retinaface-env')
-        else:
-            env_dir = os.path.join(parent_dir, 'yolo-env')
+        env_dir = get_env_dir(model_type)
         
         # Check if the environment directory exists
         if os.path.exists(env_dir):
@@ -63,21 +100,28 @@ def setup_python_path(model_type='yolo'):
             site_packages_dir = None
             # Common layout: <env>/lib/pythonX.Y/site-packages
             lib_dir = os.path.join(env_dir, 'lib')
-            if os.path.exists(lib_dir):
-                python_dirs = sorted([d for d in os.listdir(lib_dir) if d.startswith('python')])
-                for py_dir in python_dirs:
-                    candidate = os.path.join(lib_dir, py_dir, 'site-packages')
-                    if os.path.exists(candidate):
-                        site_packages_dir = candidate
-                        break
+            # scandir reports entry types from the directory listing, so only pythonX.Y directories
+            # cost a stat; sort them so the choice is deterministic when several are present
+            try:
+                with os.scandir(lib_dir) as entries:
+                    python_dirs = sorted(entry.path for entry in entries
+                                         if entry.name.startswith('python') and entry.is_dir())
+            except OSError:
+                # No lib/ directory (e.g. Windows layout) - avoids a separate existence check
+                python_dirs = []
+            for py_dir in python_dirs:
+                candidate = os.path.join(py_dir, 'site-packages')
+                if os.path.isdir(candidate):
+                    site_packages_dir = candidate
+                    break
             # Windows layout: <env>\\Lib\\site-packages
             if site_packages_dir is None:
                 win_candidate = os.path.join(env_dir, 'Lib', 'site-packages')
                 if os.path.exists(win_candidate):
                     site_packages_dir = win_candidate
             
-            # Add site-packages directory to the beginning of sys.path
-            if site_packages_dir and os.path.exists(site_packages_dir) and site_packages_dir not in sys.path:
+            # Add site-packages directory to the beginning of sys.path (its existence was checked above)
+            if site_packages_dir and site_packages_dir not in sys.path:
                 sys.path.insert(0, site_packages_dir)
                 print(f"Added {model_type} site-packages to path: {site_packages_dir}", file=sys.stderr)
             
@@ -86,30 +130,24 @@ def setup_python_path(model_type='yolo'):
                 sys.path.insert(0, env_dir)
             print(f"Added {model_type} environment to path: {env_dir}", file=sys.stderr)
             
-            # Set PYTHONPATH to include site-packages
-            if site_packages_dir and os.path.exists(site_packages_dir):
-                sep = ';' if os.name == 'nt' else ':'
-                os.environ['PYTHONPATH'] = site_packages_dir + sep + env_dir
-            else:
-                os.environ['PYTHONPATH'] = env_dir
+            # Set PYTHONPATH to include site-packages, ahead of (and without duplicating) any inherited entries
+            python_path = [site_packages_dir, env_dir] + os.environ.get('PYTHONPATH', '').split(os.pathsep)
+            os.environ['PYTHONPATH'] = os.pathsep.join(dict.fromkeys(path for path in python_path if path))
             
-            # Clear any existing imports to avoid conflicts
-            modules_to_clear = []
-            for module in list(sys.modules.keys()):
-                if any(pkg in module for pkg in ['numpy', 'torch', 'tensorflow', 'cv2', 'ultralytics']):
-                    modules_to_clear.append(module)
+            # Clear any existing imports to avoid conflicts (matched on the top-level package name)
+            modules_to_clear = [module for module in sys.modules if module.partition('.')[0] in CONFLICTING_PACKAGES]
             
             for module in modules_to_clear:
-                del sys.modules[module]
+                sys.modules.pop(module, None)
             
         else:
             print(f"Warning: Environment directory not found: {env_dir}", file=sys.stderr)
             print(f"Available directories in {parent_dir}:", file=sys.stderr)
             try:
-                for item in os.listdir(parent_dir):
-                    item_path = os.path.join(parent_dir, item)
-                    if os.path.isdir(item_path):
-                        print(f"  {item}/", file=sys.stderr)
+                with os.scandir(parent_dir) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            print(f"  {entry.name}/", file=sys.stderr)
             except Exception as e:
                 print(f"  Error listing directory: {e}", file=sys.stderr)
     
@@ -120,19 +158,9 @@ def setup_python_path(model_type='yolo'):
     
     # Test for critical dependencies based on model type
     print(f"Testing dependencies for {model_type} environment:", file=sys.stderr)
+    dependencies = []
     if model_type == 'yolo':
-        try:
-            import torch
-            print(f"  ✅ PyTorch {torch.__version__} available", file=sys.stderr)
-        except ImportError as e:
-            print(f"  ❌ PyTorch not available: {e}", file=sys.stderr)
-        
-        try:
-            import ultralytics
-            print(f"  ✅ Ultralytics {ultralytics.__version__} available", file=sys.stderr)
-        except ImportError as e:
-            print(f"  ❌ Ultralytics not available: {e}", file=sys.stderr)
-    
+        dependencies.extend(YOLO_DEPENDENCIES)
     elif model_type == 'retinaface':
         # Extra guard: only support on macOS arm64
         is_darwin = sys.platform == 'darwin'
@@ -140,32 +168,46 @@ def setup_python_path(model_type='yolo'):
         if not (is_darwin and is_arm64):
             print("  ❌ RetinaFace is only supported on Apple Silicon (arm64) Macs. Falling back to YOLO.", file=sys.stderr)
         else:
-            try:
-                # Set TensorFlow logging level to suppress AVX warnings
-                os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
-                import tensorflow as tf
-                print(f"  ✅ TensorFlow {tf.__version__} available", file=sys.stderr)
-            except ImportError as e:
-                print(f"  ❌ TensorFlow not available for RetinaFace: {e}", file=sys.stderr)
-            
-            try:
-                import retinaface
-                print(f"  ✅ RetinaFace available", file=sys.stderr)
-            except ImportError as e:
-                print(f"  ❌ RetinaFace not available: {e}", file=sys.stderr)
+            # Set TensorFlow logging level to suppress AVX warnings
+            os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+            dependencies.extend(RETINAFACE_DEPENDENCIES)
     
     # Test common dependencies
-    try:
-        import cv2
-        print(f"  ✅ OpenCV {cv2.__version__} available", file=sys.stderr)
-    except ImportError as e:
-        print(f"  ❌ OpenCV not available: {e}", file=sys.stderr)
+    dependencies.extend(COMMON_DEPENDENCIES)
+    check_dependencies(dependencies)
+
+def probe_dependency(module_name, distributions):
+    """Check one dependency, returning (version, None) if available or (None, error) if not"""
+    if distributions:
+        for distribution in distributions:
+            try:
+                return importlib.metadata.version(distribution), None
+            except importlib.metadata.PackageNotFoundError:
+                continue
+        return None, f"no installed distribution named {' or '.join(distributions)}"
     
     try:
-        import numpy as np
-        print(f"  ✅ NumPy {np.__version__} available", file=sys.stderr)
-    except ImportError as e:
-        print(f"  ❌ NumPy not available: {e}", file=sys.stderr)
+        module = importlib.import_module(module_name)
+        return getattr(module, '__version__', ''), None
+    except Exception as e:
+        return None, e
+
+def check_dependencies(dependencies):
+    """Report which (display name, module, distribution names) dependencies are available
+    
+    The checks are independent, so they run concurrently; results are printed in the given order.
+    """
+    with ThreadPoolExecutor(max_workers=len(dependencies)) as executor:
+        results = list(executor.map(probe_dependency,
+                                    [module_name for _, module_name, _ in dependencies],
+                                    [distributions for _, _, distributions in dependencies]))
+    
+    for (display_name, _, _), (version, error) in zip(dependencies, results):
+        if error is None:
+            label = f"{display_name} {version}" if version else display_name
+            print(f"  ✅ {label} available", file=sys.stderr)
+        else:
+            print(f"  ❌ {display_name} not available: {error}", file=sys.stderr)
 
 def detect_model_type():
     """Detect model type from environment or default to YOLO"""
@@ -178,38 +220,59 @@ def detect_model_type():
     
     return model_type
 
+def send_error(message, protocol_out=None):
+    """Write an error message to Electron as a protocol line
+    
+    Once subprocess_api has claimed the protocol stream, fd 1 points at stderr (see
+    claim_stdout_for_protocol), so the message must be written to that stream instead.
+    """
+    error_msg = {
+        "type": "error",
+        "message": message
+    }
+    print(json.dumps(error_msg), file=protocol_out or sys.stdout, flush=True)
+
 def main():
     """Main entry point - setup path and run subprocess API"""
+    protocol_out = None
     try:
         # Detect which model environment we need
         model_type = detect_model_type()
         
+        # Must run before anything imports torch/TensorFlow
+        configure_gpu_allocators()
+        
         # Setup Python path for the appropriate environment
         setup_python_path(model_type)
         
         # Now import and run the subprocess API
-        # Import here after path is set up
-        import subprocess_api
+        # Import here after path is set up. Locate it first so a mis-set path is reported
+        # without attempting the expensive load of its dependencies
+        spec = importlib.util.find_spec('subprocess_api')
+        if spec is None:
+            send_error("Failed to import subprocess_api: module not found on the Python path")
+            sys.stderr.write(f"Python path: {sys.path}\n")
+            sys.exit(1)
+        
+        subprocess_api = importlib.util.module_from_spec(spec)
+        sys.modules['subprocess_api'] = subprocess_api
+        spec.loader.exec_module(subprocess_api)
+        
+        # Claim the protocol stream before building the API, so errors raised while building it still reach Electron
+        protocol_out = subprocess_api.get_protocol_out()
         
         # Create and run the API
         api = subprocess_api.SubprocessAPI()
         api.run()
         
     except ImportError as e:
-        error_msg = {
-            "type": "error",
-            "message": f"Failed to import subprocess_api: {str(e)}"
-        }
-        print(json.dumps(error_msg))
+        # subprocess_api was found, so this is one of its dependencies (e.g. a torch/cv2 binary mismatch)
+        send_error(f"Failed to import subprocess_api dependencies: {str(e)}", protocol_out)
         sys.stderr.write(f"Import error: {e}\n")
         sys.stderr.write(f"Python path: {sys.path}\n")
         sys.exit(1)
     except Exception as e:
-        error_msg = {
-            "type": "error", 
-            "message": f"Launcher error: {str(e)}"
-        }
-        print(json.dumps(error_msg))
+        send_error(f"Launcher error: {str(e)}", protocol_out)
         sys.stderr.write(f"Launcher error: {e}\n")
         sys.exit(1)
 
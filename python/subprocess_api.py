@@ -12,14 +12,48 @@ import time
 import signal
 import atexit
 from calc import calc as real_calc
-from face_detection import FaceDetectionProcessor
+from face_detection import FaceDetectionProcessor, YOLO_BATCH_SIZE
+
+def claim_stdout_for_protocol():
+    """Reserve the real stdout for protocol messages and route every other stdout write to stderr
+    
+    Library banners and native-code prints then end up in stderr, so every stdout line is one JSON message.
+    Returns the stream protocol messages must be written to.
+    """
+    try:
+        sys.stdout.flush()
+        stdout_fd = sys.stdout.fileno()
+        protocol_fd = os.dup(stdout_fd)
+        os.dup2(sys.stderr.fileno(), stdout_fd)
+        return os.fdopen(protocol_fd, 'w', encoding='utf-8', buffering=1)
+    except (AttributeError, OSError, ValueError):
+        # stdout is not backed by a file descriptor (e.g. redirected in-process); keep using it as is
+        return sys.stdout
+
+# Protocol stream for this process, claimed once by get_protocol_out
+_protocol_out = None
+
+def get_protocol_out():
+    """Return the protocol stream, claiming stdout for it on first use
+    
+    Launchers call this before constructing SubprocessAPI, so an error raised while
+    constructing it can still be reported to Electron on the same stream.
+    """
+    global _protocol_out
+    if _protocol_out is None:
+        _protocol_out = claim_stdout_for_protocol()
+    return _protocol_out
 
 class SubprocessAPI:
     def __init__(self):
+        # One JSON message per line on the protocol stream; see claim_stdout_for_protocol
+        self.protocol_out = get_protocol_out()
         self.face_processor = None
         self.running = True
         self.progress_messages = []
         self.python_logs = []
+        # Serializes stdout writes from the command loop and processing worker threads
+        self.send_lock = threading.Lock()
         
         # Initialize face processor with callbacks
         self.face_processor = FaceDetectionProcessor(
@@ -49,6 +83,7 @@ class SubprocessAPI:
             self.logger.info(f"Received signal {signum}, shutting down gracefully...")
             self.running = False
             # Flush any pending output
+            self.protocol_out.flush()
             sys.stdout.flush()
             sys.stderr.flush()
             
@@ -70,6 +105,7 @@ class SubprocessAPI:
             except:
                 pass
         # Flush outputs
+        self.protocol_out.flush()
         sys.stdout.flush()
         sys.stderr.flush()
         
@@ -101,7 +137,8 @@ class SubprocessAPI:
         """Send JSON response to stdout"""
         try:
             json_response = json.dumps(response_data)
-            print(json_response, flush=True)
+            with self.send_lock:
+                print(json_response, file=self.protocol_out, flush=True)
         except Exception as e:
             self.logger.error(f"Error sending response: {e}")
             
@@ -138,11 +175,19 @@ class SubprocessAPI:
             elif cmd_type == 'load_model':
                 try:
                     model_path = data.get('model_path')
-                    success = self.face_processor.load_model(model_path)
+                    precision = data.get('precision', 'fp32')
+                    success = self.face_processor.load_model(model_path, precision)
                     return {'status': 'success' if success else 'error', 'message': 'Model loaded' if success else 'Failed to load model'}
                 except Exception as e:
                     return {'status': 'error', 'message': str(e)}
                     
+            elif cmd_type == 'unload_model':
+                try:
+                    success = self.face_processor.unload_model()
+                    return {'status': 'success' if success else 'error', 'message': 'Model unloaded' if success else 'Cannot unload model while processing'}
+                except Exception as e:
+                    return {'status': 'error', 'message': str(e)}
+                    
             elif cmd_type == 'start_processing':
                 try:
                     folder_path = data.get('folder_path')
@@ -150,11 +195,18 @@ class SubprocessAPI:
                     model = data.get('model', 'yolov8n.pt')
                     save_results = data.get('save_results', False)
                     results_folder = data.get('results_folder')
+                    batch_size = data.get('batch_size', YOLO_BATCH_SIZE)
+                    precision = data.get('precision', 'fp32')
+                    files = data.get('files')  # Optional explicit list of files to process as one batch
+                    
+                    # Reject a bad batch size here rather than failing later inside the worker thread
+                    if isinstance(batch_size, bool) or not isinstance(batch_size, int) or batch_size < 1:
+                        return {'status': 'error', 'message': f'batch_size must be a positive integer, got {batch_size!r}'}
                     
                     # Start processing in a separate thread
                     thread = threading.Thread(
                         target=self.face_processor.process_folder,
-                        args=(folder_path, confidence, model, save_results, results_folder)
+                        args=(folder_path, confidence, model, save_results, results_folder, batch_size, precision, files)
                     )
                     thread.start()
                     
@@ -6,16 +6,49 @@ Minimal subprocess communication API for testing Python connection.
 import json
 import sys
 import os
+import random
 import threading
 import time
 from pathlib import Path
 
+# Use orjson for the IPC hot path when it is installed: it encodes straight to bytes and is
+# several times faster than the stdlib encoder. orjson.JSONDecodeError subclasses json.JSONDecodeError.
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+    _loads = json.loads
+
+# Fixed-shape messages, encoded once. PONG_RESPONSE is a complete JSON object; an id is spliced in before its closing brace.
+READY_MESSAGE = _dumps({'type': 'ready', 'message': 'Python subprocess ready (minimal)'}) + b'\n'
+PONG_RESPONSE = _dumps({'type': 'response', 'response': {'status': 'success', 'message': 'pong'}})
+
 class MinimalSubprocessAPI:
     def __init__(self):
         self.running = True
         self.processing = False
         self.last_results = None
         
+        # Messages are written as bytes to the buffered stdout stream; the lock keeps lines from the
+        # processing thread and the command loop from interleaving
+        self._out = sys.stdout.buffer
+        self._out_lock = threading.Lock()
+        
+        # Command type -> handler(data)
+        self._command_handlers = {
+            'ping': self._handle_ping,
+            'echo': self._handle_echo,
+            'get_info': self._handle_get_info,
+            'get_models': self._handle_get_models,
+            'start_processing': self._handle_start_processing,
+            'stop_processing': self._handle_stop_processing,
+            'get_results': self._handle_get_results,
+            'exit': self._handle_exit,
+        }
+        
         # Setup logging to stderr to avoid conflicts with stdout communication
         self.setup_logging()
         
@@ -29,115 +62,123 @@ class MinimalSubprocessAPI:
         )
         self.logger = logging.getLogger(__name__)
         
+    def write_message(self, message, flush=True):
+        """Write one JSON message line to stdout, flushing unless more messages follow immediately"""
+        self.write_line(_dumps(message) + b'\n', flush)
+    
+    def write_line(self, line, flush=True):
+        """Write an already-encoded, newline-terminated message to stdout"""
+        with self._out_lock:
+            self._out.write(line)
+            if flush:
+                self._out.flush()
+    
     def send_response(self, response_data):
         """Send JSON response to stdout"""
         try:
-            json_response = json.dumps(response_data)
-            print(json_response, flush=True)
+            self.write_message(response_data)
         except Exception as e:
             self.logger.error(f"Error sending response: {e}")
             
-    def send_event(self, event_data):
-        """Send event to Electron main process"""
+    def send_event(self, event_data, flush=True):
+        """Send event to Electron main process (pass flush=False to coalesce with the next event)"""
         try:
             event_message = {
                 'type': 'event',
                 'event': event_data
             }
-            json_response = json.dumps(event_message)
-            print(json_response, flush=True)
+            self.write_message(event_message, flush)
         except Exception as e:
             self.logger.error(f"Error sending event: {e}")
             
     def handle_command(self, command):
         """Handle incoming command from Electron"""
         try:
-            cmd_type = command.get('type')
-            data = command.get('data', {})
-            
-            if cmd_type == 'ping':
-                return {'status': 'success', 'message': 'pong'}
-                
-            elif cmd_type == 'echo':
-                return {'status': 'success', 'message': data.get('text', '')}
-                
-            elif cmd_type == 'get_info':
-                return {
-                    'status': 'success', 
-                    'info': {
-                        'python_version': sys.version,
-                        'platform': sys.platform,
-                        'cwd': os.getcwd(),
-                        'script_location': __file__
-                    }
-                }
-                
-            elif cmd_type == 'get_models':
-                # In packaged mode, inform user about limitations
-                return {
-                    'status': 'warning', 
-                    'models': [
-                        '⚠️ ML Libraries Not Bundled - Run from Source for Full Features',
-                        'Note: Face detection models require 3.7GB+ of ML libraries',
-                        'To use all models, run: npm start (development mode)'
-                    ],
-                    'message': 'The packaged app does not include ML libraries to keep size manageable. Run from source for full functionality.'
-                }
-                
-            elif cmd_type == 'start_processing':
-                try:
-                    self.logger.info(f"Received start_processing command with data: {data}")
-                    folder_path = data.get('folder_path', '')
-                    confidence = data.get('confidence', 0.5)
-                    model = data.get('model', 'yolov8n.pt')
-                    results_folder = data.get('results_folder', '')
-                    
-                    self.logger.info(f"Processing parameters: folder_path='{folder_path}', model='{model}', confidence={confidence}")
-                    
-                    # Start processing in a separate thread
-                    thread = threading.Thread(
-                        target=self.process_images,
-                        args=(folder_path, confidence, model, results_folder)
-                    )
-                    thread.start()
-                    
-                    return {
-                        'status': 'success', 
-                        'message': 'Processing started'
-                    }
-                except Exception as e:
-                    self.logger.error(f"Error starting processing: {e}")
-                    return {'status': 'error', 'message': str(e)}
-                
-            elif cmd_type == 'stop_processing':
-                self.processing = False
-                return {
-                    'status': 'success',
-                    'message': 'Processing stopped'
-                }
-                
-            elif cmd_type == 'get_results':
-                # Return stored results from last processing
-                return {
-                    'status': 'success',
-                    'results': self.last_results or {
-                        'total_images_processed': 0,
-                        'total_faces_detected': 0,
-                        'processing_time': 0.0,
-                        'images': []
-                    }
-                }
-                
-            elif cmd_type == 'exit':
-                self.running = False
-                return {'status': 'success', 'message': 'Exiting...'}
-                
-            else:
-                return {'status': 'error', 'message': f'Unknown command type: {cmd_type}'}
+            handler = self._command_handlers.get(command.get('type'))
+            if handler is None:
+                return {'status': 'error', 'message': f"Unknown command type: {command.get('type')}"}
+            return handler(command.get('data', {}))
                 
         except Exception as e:
             self.logger.error(f"Error handling command: {e}")
             return {'status': 'error', 'message': str(e)}
+    
+    def _handle_ping(self, data):
+        return {'status': 'success', 'message': 'pong'}
+    
+    def _handle_echo(self, data):
+        return {'status': 'success', 'message': data.get('text', '')}
+    
+    def _handle_get_info(self, data):
+        return {
+            'status': 'success', 
+            'info': {
+                'python_version': sys.version,
+                'platform': sys.platform,
+                'cwd': os.getcwd(),
+                'script_location': __file__
+            }
+        }
+    
+    def _handle_get_models(self, data):
+        # In packaged mode, inform user about limitations
+        return {
+            'status': 'warning', 
+            'models': [
+                '⚠️ ML Libraries Not Bundled - Run from Source for Full Features',
+                'Note: Face detection models require 3.7GB+ of ML libraries',
+                'To use all models, run: npm start (development mode)'
+            ],
+            'message': 'The packaged app does not include ML libraries to keep size manageable. Run from source for full functionality.'
+        }
+    
+    def _handle_start_processing(self, data):
+        try:
+            self.logger.info(f"Received start_processing command with data: {data}")
+            folder_path = data.get('folder_path', '')
+            confidence = data.get('confidence', 0.5)
+            model = data.get('model', 'yolov8n.pt')
+            results_folder = data.get('results_folder', '')
+            
+            self.logger.info(f"Processing parameters: folder_path='{folder_path}', model='{model}', confidence={confidence}")
+            
+            # Start processing in a separate thread
+            thread = threading.Thread(
+                target=self.process_images,
+                args=(folder_path, confidence, model, results_folder)
+            )
+            thread.start()
+            
+            return {
+                'status': 'success', 
+                'message': 'Processing started'
+            }
+        except Exception as e:
+            self.logger.error(f"Error starting processing: {e}")
+            return {'status': 'error', 'message': str(e)}
+    
+    def _handle_stop_processing(self, data):
+        self.processing = False
+        return {
+            'status': 'success',
+            'message': 'Processing stopped'
+        }
+    
+    def _handle_get_results(self, data):
+        # Return stored results from last processing
+        return {
+            'status': 'success',
+            'results': self.last_results or {
+                'total_images_processed': 0,
+                'total_faces_detected': 0,
+                'processing_time': 0.0,
+                'images': []
+            }
+        }
+    
+    def _handle_exit(self, data):
+        self.running = False
+        return {'status': 'success', 'message': 'Exiting...'}
             
     def run(self):
         """Main subprocess loop - read commands from stdin and send responses to stdout"""
@@ -147,7 +188,7 @@ class MinimalSubprocessAPI:
         self.logger.info(f"Script location: {__file__}")
         
         # Send ready signal
-        self.send_response({'type': 'ready', 'message': 'Python subprocess ready (minimal)'})
+        self.write_line(READY_MESSAGE)
         
         while self.running:
             try:
@@ -162,13 +203,21 @@ class MinimalSubprocessAPI:
                     
                 # Parse JSON command
                 try:
-                    command = json.loads(line)
+                    command = _loads(line)
                 except json.JSONDecodeError as e:
                     self.send_response({
                         'type': 'error',
                         'message': f'Invalid JSON: {e}'
                     })
                     continue
+                
+                # Keepalive fast path: reply from the pre-encoded pong instead of building and encoding a dict
+                if command.get('type') == 'ping':
+                    if 'id' in command:
+                        self.write_line(PONG_RESPONSE[:-1] + b',"id":' + _dumps(command['id']) + b'}\n')
+                    else:
+                        self.write_line(PONG_RESPONSE + b'\n')
+                    continue
                     
                 # Handle command
                 response = self.handle_command(command)
@@ -236,7 +285,7 @@ class MinimalSubprocessAPI:
             
             # Process each file
             total_faces = 0
-            start_time = time.time()
+            start_time = time.monotonic()
             processed_images = []
             
             for i, file_path in enumerate(files):
@@ -252,7 +301,6 @@ class MinimalSubprocessAPI:
                 time.sleep(0.5)
                 
                 # Mock face detection (simulate finding faces)
-                import random
                 faces_found = random.randint(0, 3)  # Random 0-3 faces
                 total_faces += faces_found
                 
@@ -269,7 +317,7 @@ class MinimalSubprocessAPI:
                         'progress_percent': progress_percent,
                         'file_path': str(file_path)
                     }
-                })
+                }, flush=False)
                 
                 self.send_event({
                     'type': 'progress',
@@ -283,7 +331,7 @@ class MinimalSubprocessAPI:
                     'processing_time': 0.5  # Mock processing time per image
                 })
             
-            processing_time = time.time() - start_time
+            processing_time = time.monotonic() - start_time
             
             if self.processing:
                 # Store results for get_results command
@@ -304,7 +352,7 @@ class MinimalSubprocessAPI:
                         'processing_time': processing_time,
                         'results_folder': results_folder
                     }
-                })
+                }, flush=False)
                 
                 self.send_event({
                     'type': 'progress',
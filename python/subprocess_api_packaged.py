@@ -12,7 +12,7 @@ import time
 
 # Try to import face detection, but fall back to minimal if not available
 try:
-    from face_detection import FaceDetectionProcessor
+    from face_detection import FaceDetectionProcessor, YOLO_BATCH_SIZE
     FACE_DETECTION_AVAILABLE = True
 except ImportError as e:
     print(f"Face detection not available in packaged mode: {e}", file=sys.stderr)
@@ -132,11 +132,18 @@ class SubprocessAPI:
                 model = data.get('model', 'yolov8n.pt')
                 save_results = data.get('save_results', False)
                 results_folder = data.get('results_folder', '')
+                batch_size = data.get('batch_size', YOLO_BATCH_SIZE)
+                precision = data.get('precision', 'fp32')
+                files = data.get('files')  # Optional explicit list of files to process as one batch
+                
+                # Reject a bad batch size here rather than failing later inside the worker thread
+                if isinstance(batch_size, bool) or not isinstance(batch_size, int) or batch_size < 1:
+                    return {'status': 'error', 'message': f'batch_size must be a positive integer, got {batch_size!r}'}
                 
                 # Start processing in a separate thread
                 thread = threading.Thread(
                     target=self.face_processor.process_folder,
-                    args=(folder_path, confidence, model, save_results, results_folder)
+                    args=(folder_path, confidence, model, save_results, results_folder, batch_size, precision, files)
                 )
                 thread.start()
                 